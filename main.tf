@@ -2,7 +2,7 @@
 # All values are hardcoded directly to eliminate variables complexity
 
 terraform {
-  required_version = ">= 1.0"
+  required_version = ">= 1.1"
   required_providers {
     aws = {
       source  = "hashicorp/aws"
@@ -87,7 +87,15 @@ module "s3_bucket_athena_results" {
 module "iam_role" {
   source = "./modules/iam_role"
 
-  role_name = "lambda_kinesis_dynamodb_role"
+  role_name   = "lambda_kinesis_dynamodb_role"
+  description = "IAM role for Lambda function to process stock market data from Kinesis and store in DynamoDB"
+
+  # Raw records are archived by Firehose, so the consumer needs no S3 access
+  managed_policy_arns = [
+    "arn:aws:iam::aws:policy/AmazonKinesisFullAccess",
+    "arn:aws:iam::aws:policy/AmazonDynamoDBFullAccess",
+    "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
+  ]
 
   tags = {
     Project     = "stock-analytics"
@@ -128,13 +136,24 @@ module "lambda_function" {
   filename                           = "modules/lambda_function/lambda_consumer/lambda_function.zip"
   source_code_hash                   = filebase64sha256("modules/lambda_function/lambda_consumer/lambda_function.zip")
   kinesis_stream_arn                 = module.kinesis.stream_arn
-  batch_size                         = 2
-  maximum_batching_window_in_seconds = 0
   starting_position                  = "LATEST"
 
+  # Deliver up to 100 records per invocation (waiting at most 2 s to fill a batch) so the
+  # handler's 25-item BatchWriteItem calls carry full batches instead of 1-2 items
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 2
+
+  # Process up to 10 batches per shard concurrently. Lambda keeps records with the same
+  # partition key (symbol) in order, and writes are idempotent on symbol + timestamp.
+  # The handler reports records whose DynamoDB write failed in batchItemFailures; Lambda
+  # then splits the batch at the first failed record and retries only from there.
+  parallelization_factor         = 10
+  bisect_batch_on_function_error = true
+  function_response_types        = ["ReportBatchItemFailures"]
+
   environment_variables = {
     DYNAMODB_TABLE_NAME = module.dynamodb.table_name
-    S3_BUCKET_NAME      = module.s3_bucket.bucket_name
+    LOG_LEVEL           = "INFO" # per-invocation summary; DEBUG adds per-record logs
   }
 
   tags = {
@@ -146,11 +165,29 @@ module "lambda_function" {
   depends_on = [
     module.kinesis,
     module.dynamodb,
-    module.s3_bucket,
     module.iam_role
   ]
 }
 
+# Kinesis Data Firehose archiving raw records to S3 (raw/{year}/{month}/{day}/{hour}/)
+module "firehose_archive" {
+  source = "./modules/firehose"
+
+  delivery_stream_name = "stock-market-archive"
+  kinesis_stream_arn   = module.kinesis.stream_arn
+  bucket_arn           = module.s3_bucket.bucket_arn
+  prefix               = "raw/"
+  buffering_size       = 128
+  buffering_interval   = 300
+  compression_format   = "GZIP"
+
+  tags = {
+    Project     = "stock-analytics"
+    Environment = "dev"
+    ManagedBy   = "terraform"
+  }
+}
+
 # Glue Catalog Module for Athena
 module "glue_catalog" {
   source = "./modules/glue_catalog"
@@ -218,3 +255,80 @@ module "lambda_trend_analysis" {
     module.sns_trend_alerts
   ]
 }
+
+# IAM Role for Stock Data Producer Lambda (Kinesis writes and Lambda basic execution)
+module "iam_role_producer" {
+  source = "./modules/iam_role"
+
+  role_name = "StockProducerLambdaRole"
+
+  managed_policy_arns = [
+    "arn:aws:iam::aws:policy/AmazonKinesisFullAccess",
+    "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
+  ]
+
+  tags = {
+    Project     = "stock-analytics"
+    Environment = "dev"
+    ManagedBy   = "terraform"
+  }
+}
+
+# Lambda layer ARNs providing yfinance (and its pandas/numpy dependencies) for the producer.
+# The producer schedule stays disabled until at least one layer is set.
+locals {
+  producer_layers = []
+}
+
+# Lambda Function for the Stock Data Producer (triggered on a schedule)
+module "lambda_producer" {
+  source = "./modules/lambda_function"
+
+  function_name      = "ProducerStockData"
+  execution_role_arn = module.iam_role_producer.role_arn
+  runtime            = "python3.13"
+  handler            = "producer_data_function.producer_handler"
+  timeout            = 60
+  memory_size        = 512
+
+  filename         = "modules/lambda_function/lambda_producer/lambda_function.zip"
+  source_code_hash = filebase64sha256("modules/lambda_function/lambda_producer/lambda_function.zip")
+
+  layers = local.producer_layers
+
+  # Invoked by EventBridge, not by a stream
+  create_event_source_mapping = false
+
+  environment_variables = {
+    KINESIS_STREAM_NAME = module.kinesis.stream_name
+    SYMBOLS             = "AAPL"
+  }
+
+  tags = {
+    Project     = "stock-analytics"
+    Environment = "dev"
+    ManagedBy   = "terraform"
+  }
+
+  depends_on = [
+    module.kinesis,
+    module.iam_role_producer
+  ]
+}
+
+# EventBridge schedule that invokes the producer (replaces the local sleep loop)
+module "producer_schedule" {
+  source = "./modules/eventbridge_schedule"
+
+  rule_name            = "stock-producer-schedule"
+  schedule_expression  = "rate(1 minute)"
+  enabled              = length(local.producer_layers) > 0
+  lambda_function_arn  = module.lambda_producer.function_arn
+  lambda_function_name = module.lambda_producer.function_name
+
+  tags = {
+    Project     = "stock-analytics"
+    Environment = "dev"
+    ManagedBy   = "terraform"
+  }
+}
@@ -0,0 +1,23 @@
+resource "aws_cloudwatch_event_rule" "this" {
+  name                = var.rule_name
+  description         = var.description
+  schedule_expression = var.schedule_expression
+  state               = var.enabled ? "ENABLED" : "DISABLED"
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "lambda" {
+  rule      = aws_cloudwatch_event_rule.this.name
+  target_id = var.rule_name
+  arn       = var.lambda_function_arn
+}
+
+# Allow EventBridge to invoke the target Lambda function
+resource "aws_lambda_permission" "allow_eventbridge" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = var.lambda_function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.this.arn
+}
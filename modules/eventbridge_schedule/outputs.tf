@@ -0,0 +1,14 @@
+output "rule_arn" {
+  description = "ARN of the EventBridge rule"
+  value       = aws_cloudwatch_event_rule.this.arn
+}
+
+output "rule_name" {
+  description = "Name of the EventBridge rule"
+  value       = aws_cloudwatch_event_rule.this.name
+}
+
+output "schedule_expression" {
+  description = "Schedule expression of the EventBridge rule"
+  value       = aws_cloudwatch_event_rule.this.schedule_expression
+}
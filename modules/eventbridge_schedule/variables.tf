@@ -0,0 +1,72 @@
+# =============================================================================
+# EVENTBRIDGE SCHEDULE MODULE VARIABLES
+# =============================================================================
+# This module creates an EventBridge rule that invokes a Lambda function on a schedule
+# Dependencies: Lambda function ARN and name (from lambda_function module)
+# Used by: Stock data producer (fetches quotes and sends them to Kinesis on each run)
+
+variable "rule_name" {
+  description = "Name of the EventBridge rule. Must be unique within the AWS account and region."
+  type        = string
+
+  validation {
+    condition = can(regex("^[a-zA-Z0-9._-]+$", var.rule_name)) && length(var.rule_name) >= 1 && length(var.rule_name) <= 64
+    error_message = "Rule name must be 1-64 characters and contain only letters, numbers, periods, hyphens, and underscores."
+  }
+}
+
+variable "description" {
+  description = "Description of the EventBridge rule explaining what it triggers."
+  type        = string
+  default     = "Invokes the stock data producer Lambda function on a schedule"
+
+  validation {
+    condition = length(var.description) <= 512
+    error_message = "Description must be no more than 512 characters long."
+  }
+}
+
+variable "schedule_expression" {
+  description = "Schedule expression for the rule, e.g. 'rate(1 minute)' or 'cron(0/5 * * * ? *)'. EventBridge schedules have a minimum granularity of one minute."
+  type        = string
+  default     = "rate(1 minute)"
+
+  validation {
+    condition = can(regex("^(rate|cron)\\(.+\\)$", var.schedule_expression))
+    error_message = "Schedule expression must be a valid rate() or cron() expression."
+  }
+}
+
+variable "enabled" {
+  description = "Whether the schedule is enabled. Disable to pause the producer without destroying it."
+  type        = bool
+  default     = true
+}
+
+variable "lambda_function_arn" {
+  description = "ARN of the Lambda function invoked by the schedule. Provided by the lambda_function module."
+  type        = string
+
+  validation {
+    condition = can(regex("^arn:aws:lambda:[a-z0-9-]+:[0-9]{12}:function:.+$", var.lambda_function_arn))
+    error_message = "Lambda function ARN must be a valid Lambda function ARN."
+  }
+}
+
+variable "lambda_function_name" {
+  description = "Name of the Lambda function invoked by the schedule. Used to grant EventBridge permission to invoke it."
+  type        = string
+}
+
+variable "tags" {
+  description = "A map of tags to assign to the EventBridge rule. Tags are used for resource organization, cost allocation, and access control."
+  type        = map(string)
+  default     = {}
+
+  validation {
+    condition = alltrue([
+      for k, v in var.tags : can(regex("^[\\w\\s+=.:/@-]*$", k)) && can(regex("^[\\w\\s+=.:/@-]*$", v))
+    ])
+    error_message = "Tag keys and values must contain only alphanumeric characters, spaces, and the following characters: + = . : / @ -"
+  }
+}
@@ -0,0 +1,128 @@
+# IAM Role assumed by Firehose to read from Kinesis and write to S3
+resource "aws_iam_role" "firehose_role" {
+  name = "${var.delivery_stream_name}-role"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = "sts:AssumeRole"
+        Effect = "Allow"
+        Principal = {
+          Service = "firehose.amazonaws.com"
+        }
+      }
+    ]
+  })
+
+  tags = var.tags
+}
+
+resource "aws_iam_role_policy" "firehose_policy" {
+  name = "${var.delivery_stream_name}-policy"
+  role = aws_iam_role.firehose_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "kinesis:DescribeStream",
+          "kinesis:GetShardIterator",
+          "kinesis:GetRecords",
+          "kinesis:ListShards"
+        ]
+        Resource = var.kinesis_stream_arn
+      },
+      {
+        # The source stream is encrypted with the AWS managed Kinesis key
+        Effect   = "Allow"
+        Action   = ["kms:Decrypt"]
+        Resource = "*"
+        Condition = {
+          StringLike = {
+            "kms:ViaService" = "kinesis.*.amazonaws.com"
+          }
+        }
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:AbortMultipartUpload",
+          "s3:GetBucketLocation",
+          "s3:GetObject",
+          "s3:ListBucket",
+          "s3:ListBucketMultipartUploads",
+          "s3:PutObject"
+        ]
+        Resource = [
+          var.bucket_arn,
+          "${var.bucket_arn}/*"
+        ]
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["logs:PutLogEvents"]
+        Resource = "*"
+      }
+    ]
+  })
+}
+
+# Firehose delivery stream archiving raw Kinesis records to S3, partitioned by record timestamp
+resource "aws_kinesis_firehose_delivery_stream" "this" {
+  name        = var.delivery_stream_name
+  destination = "extended_s3"
+
+  kinesis_source_configuration {
+    kinesis_stream_arn = var.kinesis_stream_arn
+    role_arn           = aws_iam_role.firehose_role.arn
+  }
+
+  extended_s3_configuration {
+    role_arn           = aws_iam_role.firehose_role.arn
+    bucket_arn         = var.bucket_arn
+    buffering_size     = var.buffering_size
+    buffering_interval = var.buffering_interval
+    compression_format = var.compression_format
+
+    # raw/{year}/{month}/{day}/{hour}/ taken from the record's own timestamp
+    prefix              = "${var.prefix}!{partitionKeyFromQuery:year}/!{partitionKeyFromQuery:month}/!{partitionKeyFromQuery:day}/!{partitionKeyFromQuery:hour}/"
+    error_output_prefix = "${var.error_output_prefix}!{firehose:error-output-type}/!{timestamp:yyyy/MM/dd}/"
+
+    dynamic_partitioning_configuration {
+      enabled = true
+    }
+
+    processing_configuration {
+      enabled = true
+
+      processors {
+        type = "MetadataExtraction"
+
+        parameters {
+          parameter_name  = "JsonParsingEngine"
+          parameter_value = "JQ-1.6"
+        }
+
+        parameters {
+          parameter_name  = "MetadataExtractionQuery"
+          parameter_value = "{year: .timestamp[0:4], month: .timestamp[5:7], day: .timestamp[8:10], hour: .timestamp[11:13]}"
+        }
+      }
+
+      # Newline-delimit records so Athena's JSON SerDe reads one record per line
+      processors {
+        type = "AppendDelimiterToRecord"
+
+        parameters {
+          parameter_name  = "Delimiter"
+          parameter_value = "\\n"
+        }
+      }
+    }
+  }
+
+  tags = var.tags
+}
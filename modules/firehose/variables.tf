@@ -0,0 +1,105 @@
+# =============================================================================
+# FIREHOSE DELIVERY STREAM MODULE VARIABLES
+# =============================================================================
+# This module creates a Kinesis Data Firehose delivery stream that archives raw records to S3
+# Dependencies: Kinesis stream ARN (from kinesis module), S3 bucket ARN (from s3_bucket module)
+# Used by: Glue Catalog / Athena (queries the archived raw data under the S3 prefix)
+
+variable "delivery_stream_name" {
+  description = "Name of the Firehose delivery stream. Must be unique within the AWS account and region. Also used to name the IAM role and policy created for Firehose."
+  type        = string
+  default     = "stock-market-archive"
+
+  validation {
+    condition = can(regex("^[a-zA-Z0-9_.-]+$", var.delivery_stream_name)) && length(var.delivery_stream_name) >= 1 && length(var.delivery_stream_name) <= 64
+    error_message = "Delivery stream name must be 1-64 characters and contain only letters, numbers, underscores, periods, and hyphens."
+  }
+}
+
+variable "kinesis_stream_arn" {
+  description = "ARN of the Kinesis stream Firehose reads from. Provided by the kinesis module."
+  type        = string
+
+  validation {
+    condition = can(regex("^arn:aws:kinesis:[a-z0-9-]+:[0-9]{12}:stream/.*$", var.kinesis_stream_arn))
+    error_message = "Kinesis stream ARN must be a valid Kinesis stream ARN."
+  }
+}
+
+variable "bucket_arn" {
+  description = "ARN of the S3 bucket that receives the archived records. Provided by the s3_bucket module."
+  type        = string
+
+  validation {
+    condition = can(regex("^arn:aws:s3:::.+$", var.bucket_arn))
+    error_message = "Bucket ARN must be a valid S3 bucket ARN."
+  }
+}
+
+variable "prefix" {
+  description = "S3 key prefix for archived records. Year/month/day/hour partitions taken from each record's timestamp are appended to it. Must end with a forward slash."
+  type        = string
+  default     = "raw/"
+
+  validation {
+    condition = can(regex("/$", var.prefix))
+    error_message = "Prefix must end with '/'."
+  }
+}
+
+variable "error_output_prefix" {
+  description = "S3 key prefix for records Firehose fails to process or partition. Keep it outside the data prefix so Athena does not read failed records."
+  type        = string
+  default     = "errors/"
+
+  validation {
+    condition = can(regex("/$", var.error_output_prefix))
+    error_message = "Error output prefix must end with '/'."
+  }
+}
+
+variable "buffering_size" {
+  description = "Buffer size in MB before Firehose writes an object to S3. Dynamic partitioning requires at least 64 MB. Larger buffers mean fewer, bigger objects."
+  type        = number
+  default     = 128
+
+  validation {
+    condition = var.buffering_size >= 64 && var.buffering_size <= 128
+    error_message = "Buffering size must be between 64 and 128 MB when dynamic partitioning is enabled."
+  }
+}
+
+variable "buffering_interval" {
+  description = "Maximum time in seconds Firehose buffers data before writing to S3. Lower values make data queryable sooner; higher values produce fewer objects."
+  type        = number
+  default     = 300
+
+  validation {
+    condition = var.buffering_interval >= 60 && var.buffering_interval <= 900
+    error_message = "Buffering interval must be between 60 and 900 seconds."
+  }
+}
+
+variable "compression_format" {
+  description = "Compression applied to archived objects. Athena reads GZIP-compressed JSON transparently."
+  type        = string
+  default     = "GZIP"
+
+  validation {
+    condition = contains(["UNCOMPRESSED", "GZIP", "ZIP", "Snappy", "HADOOP_SNAPPY"], var.compression_format)
+    error_message = "Compression format must be one of: UNCOMPRESSED, GZIP, ZIP, Snappy, HADOOP_SNAPPY."
+  }
+}
+
+variable "tags" {
+  description = "A map of tags to assign to the Firehose delivery stream and its IAM role. Tags are used for resource organization, cost allocation, and access control."
+  type        = map(string)
+  default     = {}
+
+  validation {
+    condition = alltrue([
+      for k, v in var.tags : can(regex("^[\\w\\s+=.:/@-]*$", k)) && can(regex("^[\\w\\s+=.:/@-]*$", v))
+    ])
+    error_message = "Tag keys and values must contain only alphanumeric characters, spaces, and the following characters: + = . : / @ -"
+  }
+}
@@ -16,7 +16,7 @@ resource "aws_glue_catalog_table" "stock_data_table" {
 
   parameters = {
     "classification"                   = "json"
-    "compressionType"                 = "none"
+    "compressionType"                 = "gzip"
     "typeOfData"                      = "file"
     "useGlueParquetWriter"           = "true"
     "projection.enabled"              = "false"
@@ -63,11 +63,17 @@ resource "aws_glue_catalog_table" "stock_data_table" {
       type = "double"
     }
 
+    # Schema v1 records carry a decimal price; v2 records carry integer price_cents
     columns {
       name = "price"
       type = "double"
     }
 
+    columns {
+      name = "price_cents"
+      type = "bigint"
+    }
+
     columns {
       name = "previous_close"
       type = "double"
@@ -77,6 +83,11 @@ resource "aws_glue_catalog_table" "stock_data_table" {
       name = "volume"
       type = "double"
     }
+
+    columns {
+      name = "schema_version"
+      type = "int"
+    }
   }
 
   # Note: aws_glue_catalog_table doesn't support tags directly
@@ -50,7 +50,7 @@ output "sample_athena_query" {
       open,
       high,
       low,
-      price,
+      COALESCE(price_cents / 100.0, price) AS price,
       previous_close,
       volume
     FROM ${aws_glue_catalog_database.stock_data_db.name}.${aws_glue_catalog_table.stock_data_table.name}
@@ -3,70 +3,128 @@ import boto3
 import base64
 import os
 import logging
-from datetime import datetime
-from decimal import Decimal
+import math
+import re
+import time
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from datetime import datetime, timezone
+from decimal import Context
 
-# Configure logging
+# Configure logging (per-record messages are DEBUG; override the level with LOG_LEVEL)
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").upper()
+# An unknown level name falls back to WARNING instead of failing the init phase
+logger.setLevel(logging.getLevelNamesMapping().get(LOG_LEVEL, logging.WARNING))
+if LOG_LEVEL not in logging.getLevelNamesMapping():
+    logger.warning("Unknown LOG_LEVEL %r, using WARNING", LOG_LEVEL)
 
-# Initialize AWS Clients
-dynamodb = boto3.resource("dynamodb")
-s3 = boto3.client("s3")
+# Client config: a larger keep-alive connection pool lets warm invocations reuse
+# HTTPS connections instead of paying a new TLS handshake
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True
+)
+
+# Initialize AWS Clients (module scope so they survive across warm invocations)
+dynamodb_client = boto3.client("dynamodb", config=BOTO_CONFIG)
 
 # Resource Names from environment variables
 DYNAMO_TABLE = os.environ.get("DYNAMODB_TABLE_NAME", "stock-market-data")
-S3_BUCKET = os.environ.get("S3_BUCKET_NAME", "stock-market-data-bucket-121485")
 
-# Table reference
-table = dynamodb.Table(DYNAMO_TABLE)
+# BatchWriteItem limits and retry policy for UnprocessedItems
+MAX_BATCH_SIZE = 25
+MAX_BATCH_RETRIES = 5
+BATCH_RETRY_BASE_DELAY = 0.05  # seconds, doubled on each retry
+
+# Fields every record must carry (plus price_cents, or price for schema v1 records)
+REQUIRED_FIELDS = frozenset(["symbol", "timestamp"])
+
+# Accepted string forms for numeric fields
+PRICE_RE = re.compile(r"-?\d+(\.\d+)?")
+VOLUME_RE = re.compile(r"-?\d+")
+
+# Decimal context for converting schema v1 prices, built once and reused for every record
+PRICE_CONTEXT = Context(prec=12)
+
+
+def warm_up_clients():
+    """
+    Do the client's lazy setup during the init phase instead of on the first invocation.
+    No network call is made, so a slow or unreachable endpoint can't stall the init phase.
+    """
+    # Build the request/response shapes used on the hot path (the properties are cached on first access)
+    operation_model = dynamodb_client.meta.service_model.operation_model("BatchWriteItem")
+    _ = operation_model.input_shape
+    _ = operation_model.output_shape
+
+
+warm_up_clients()
 
 def lambda_handler(event, context):
     """
-    Process Kinesis records containing stock market data.
-    Store processed data in DynamoDB and archive raw data in S3.
+    Process Kinesis records containing stock market data and store them in DynamoDB.
+    Raw records are archived to S3 by Kinesis Data Firehose, not by this function.
+    Records whose write failed with a retryable error are returned in batchItemFailures.
     """
     processed_count = 0
     failed_count = 0
+    items = []
+    # Sequence number of the record each item was built from, keyed on the table key
+    sequence_numbers = {}
+    
+    # Processing timestamp shared by every record in this invocation
+    processed_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
     
-    logger.info(f"Processing {len(event['Records'])} Kinesis records")
+    logger.debug("Processing %d Kinesis records", len(event['Records']))
     
     for record in event['Records']:
         try:
-            # Decode base64 Kinesis data
-            raw_data = base64.b64decode(record["kinesis"]["data"]).decode("utf-8")
+            # Decode base64 Kinesis data (json.loads parses the UTF-8 bytes directly)
+            raw_data = base64.b64decode(record["kinesis"]["data"])
             payload = json.loads(raw_data)
             
-            logger.info(f"Processing record for symbol: {payload.get('symbol', 'UNKNOWN')}")
-            
             # Validate required fields
-            if not validate_record(payload):
-                logger.error(f"Invalid record format: {payload}")
+            error = validate_record(payload)
+            if error:
+                # Log identifying fields only, never the full payload
+                logger.error(
+                    "Invalid record %s: symbol=%s reason=%s",
+                    record["kinesis"].get("sequenceNumber"),
+                    payload.get("symbol") if isinstance(payload, dict) else None,
+                    error
+                )
                 failed_count += 1
                 continue
             
-            # Archive raw data to S3
-            archive_success = archive_raw_data_to_s3(payload)
-            if not archive_success:
-                logger.warning("Failed to archive raw data to S3, continuing with processing")
+            logger.debug("Processing record for symbol: %s", payload["symbol"])
             
-            # Process and store data in DynamoDB
-            dynamodb_success = store_processed_data_in_dynamodb(payload)
-            if dynamodb_success:
-                processed_count += 1
-                logger.info(f"Successfully processed record for {payload['symbol']}")
-            else:
-                failed_count += 1
-                logger.error(f"Failed to store processed data for {payload['symbol']}")
+            # Build the DynamoDB item; writes are flushed in batches below
+            item = build_item(payload, processed_at)
+            items.append(item)
+            sequence_numbers[item_key(item)] = record["kinesis"]["sequenceNumber"]
                 
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON from Kinesis record: {e}")
+            logger.error("Failed to decode JSON from Kinesis record: %s", e)
             failed_count += 1
         except Exception as e:
-            logger.error(f"Unexpected error processing record: {e}")
+            logger.error(
+                "Unexpected error processing record %s: %s: %s",
+                record.get("kinesis", {}).get("sequenceNumber"), type(e).__name__, e
+            )
             failed_count += 1
     
-    logger.info(f"Processing complete. Processed: {processed_count}, Failed: {failed_count}")
+    # Store processed data in DynamoDB
+    batch_item_failures = []
+    if items:
+        store_failed_count, retryable_items = store_processed_data_in_dynamodb(items)
+        processed_count += len(items) - store_failed_count
+        failed_count += store_failed_count
+        # Invalid records are dropped; only writes that may succeed on retry are reported back to Lambda
+        batch_item_failures = [{"itemIdentifier": sequence_numbers[item_key(item)]} for item in retryable_items]
+    
+    logger.info("Processing complete. Processed: %d, Failed: %d", processed_count, failed_count)
     
     return {
         "statusCode": 200,
@@ -74,89 +132,161 @@ def lambda_handler(event, context):
             "message": "Processing complete",
             "processed_count": processed_count,
             "failed_count": failed_count
-        })
+        }),
+        "batchItemFailures": batch_item_failures
     }
 
 
 def validate_record(payload):
     """
-    Validate that the record contains required fields.
+    Validate that the record contains required fields with usable values.
+    Returns None for a valid record, otherwise a short reason for the handler to log.
     """
-    required_fields = ["symbol", "price", "timestamp"]
+    if not isinstance(payload, dict):
+        return f"record is a JSON {type(payload).__name__}, not an object"
     
-    for field in required_fields:
-        if field not in payload:
-            logger.error(f"Missing required field: {field}")
-            return False
+    # Single C-level subset check on the key view; only compute what's missing on failure
+    if not payload.keys() >= REQUIRED_FIELDS:
+        return f"missing required fields {sorted(REQUIRED_FIELDS - payload.keys())}"
     
-    # Validate data types
-    try:
-        float(payload["price"])
-        if "volume" in payload:
-            int(payload["volume"])
-    except (ValueError, TypeError) as e:
-        logger.error(f"Invalid data type in payload: {e}")
-        return False
+    # Key attributes must be non-empty strings; DynamoDB rejects the whole batch otherwise
+    for field in REQUIRED_FIELDS:
+        value = payload[field]
+        if not isinstance(value, str) or not value:
+            return f"invalid key attribute {field}={value!r}"
+    
+    # Validate data types with isinstance checks, keeping exception handling off the hot path
+    if "price_cents" in payload:
+        price_cents = payload["price_cents"]
+        if not isinstance(price_cents, int) or isinstance(price_cents, bool):
+            return f"invalid price_cents of type {type(price_cents).__name__}"
+    elif "price" in payload:
+        # Schema v1 records carry a decimal price
+        if not is_number(payload["price"], PRICE_RE):
+            return f"invalid price {payload['price']!r}"
+    else:
+        return "missing required fields ['price_cents']"
+    
+    if "volume" in payload and not is_number(payload["volume"], VOLUME_RE):
+        return f"invalid volume {payload['volume']!r}"
     
-    return True
+    return None
 
 
-def archive_raw_data_to_s3(payload):
+def is_number(value, pattern):
     """
-    Archive raw data to S3 with organized folder structure.
+    Check for a finite JSON number (bools excluded) or a numeric string matching pattern.
     """
-    try:
-        # Parse timestamp for folder organization
-        timestamp = payload["timestamp"]
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        
-        # Create S3 key with organized structure: raw/{year}/{month}/{day}/{hour}/
-        s3_key = f"raw/{dt.year:04d}/{dt.month:02d}/{dt.day:02d}/{dt.hour:02d}/kinesis-records-{payload['symbol']}-{dt.strftime('%Y%m%d%H%M%S')}.json"
-        
-        s3.put_object(
-            Bucket=S3_BUCKET,
-            Key=s3_key,
-            Body=json.dumps(payload, default=str),
-            ContentType='application/json'
-        )
-        
-        logger.info(f"Raw data archived to S3: {s3_key}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to archive raw data to S3: {e}")
+    if isinstance(value, bool):
         return False
+    if isinstance(value, int):
+        return True
+    if isinstance(value, float):
+        # json.loads accepts NaN and Infinity literals
+        return math.isfinite(value)
+    return isinstance(value, str) and pattern.fullmatch(value) is not None
 
 
-def store_processed_data_in_dynamodb(payload):
-    """
-    Store processed stock data in DynamoDB.
-    """
-    try:
-        # Get current timestamp for processing metadata
-        processed_at = datetime.utcnow().isoformat() + 'Z'
-        
-        # Prepare data for DynamoDB (convert floats to Decimal for DynamoDB compatibility)
-        processed_data = {
-            "symbol": payload["symbol"],
-            "timestamp": payload["timestamp"],
-            "price": Decimal(str(payload["price"])),
-            "processed_at": processed_at
-        }
-        
-        # Add optional fields if present
-        if "volume" in payload:
-            processed_data["volume"] = int(payload["volume"])
-        
-        if "exchange" in payload:
-            processed_data["exchange"] = payload["exchange"]
-        
-        # Store in DynamoDB
-        table.put_item(Item=processed_data)
-        
-        logger.info(f"Data stored in DynamoDB for {payload['symbol']} at {payload['timestamp']}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to store data in DynamoDB: {e}")
-        return False
\ No newline at end of file
+def build_item(payload, processed_at):
+    """
+    Build the DynamoDB item for a validated stock record in low-level attribute-value form.
+    """
+    # Prepare data for DynamoDB (numbers are sent as strings in "N" attributes)
+    # Prices are stored as integer cents; schema v1 records are converted from their decimal price
+    if "price_cents" in payload:
+        price_cents = payload["price_cents"]
+    else:
+        price = payload["price"]
+        price = (
+            PRICE_CONTEXT.create_decimal(price) if isinstance(price, str)
+            else PRICE_CONTEXT.create_decimal_from_float(float(price))
+        )
+        price_cents = int((price * 100).to_integral_value())
+    
+    processed_data = {
+        "symbol": {"S": str(payload["symbol"])},
+        "timestamp": {"S": str(payload["timestamp"])},
+        "price_cents": {"N": str(price_cents)},
+        "processed_at": {"S": processed_at}
+    }
+    
+    # Add optional fields if present
+    if "volume" in payload:
+        volume = payload["volume"]
+        processed_data["volume"] = {"N": str(volume if isinstance(volume, int) else int(volume))}
+    
+    if "exchange" in payload:
+        processed_data["exchange"] = {"S": str(payload["exchange"])}
+    
+    return processed_data
+
+
+def item_key(item):
+    """
+    Return the table key (symbol, timestamp) of a DynamoDB item.
+    """
+    return item["symbol"]["S"], item["timestamp"]["S"]
+
+
+def store_processed_data_in_dynamodb(items):
+    """
+    Store processed stock data in DynamoDB with BatchWriteItem, 25 items per call.
+    UnprocessedItems are retried with exponential backoff. Returns the number of items not stored
+    and the list of those that failed with a retryable error.
+    """
+    # Deduplicate on the table key; BatchWriteItem rejects a request that carries the same key twice
+    items = list({item_key(item): item for item in items}.values())
+    failed_count = 0
+    retryable_items = []
+    
+    for start in range(0, len(items), MAX_BATCH_SIZE):
+        batch = items[start:start + MAX_BATCH_SIZE]
+        request = {DYNAMO_TABLE: [{"PutRequest": {"Item": item}} for item in batch]}
+        try:
+            for attempt in range(MAX_BATCH_RETRIES + 1):
+                response = dynamodb_client.batch_write_item(RequestItems=request)
+                request = response.get("UnprocessedItems")
+                if not request:
+                    break
+                if attempt < MAX_BATCH_RETRIES:
+                    time.sleep(BATCH_RETRY_BASE_DELAY * 2 ** attempt)
+            
+            if request:
+                unprocessed = [put["PutRequest"]["Item"] for put in request[DYNAMO_TABLE]]
+                logger.error("Failed to store %d items in DynamoDB after %d retries", len(unprocessed), MAX_BATCH_RETRIES)
+                failed_count += len(unprocessed)
+                retryable_items.extend(unprocessed)
+            
+        except Exception as e:
+            pending = [put["PutRequest"]["Item"] for put in request[DYNAMO_TABLE]]
+            if isinstance(e, ClientError) and e.response["Error"]["Code"] == "ValidationException":
+                # One invalid item fails the whole batch; write the items one by one so only the bad ones are lost
+                logger.warning("BatchWriteItem rejected a batch of %d items, writing them individually: %s", len(pending), e)
+                batch_failed_count, batch_retryable_items = put_items_individually(pending)
+                failed_count += batch_failed_count
+                retryable_items.extend(batch_retryable_items)
+            else:
+                logger.error("Failed to store data in DynamoDB: %s", e)
+                failed_count += len(pending)
+                retryable_items.extend(pending)
+    
+    logger.debug("Stored %d items in DynamoDB", len(items) - failed_count)
+    return failed_count, retryable_items
+
+
+def put_items_individually(items):
+    """
+    Store items one at a time with PutItem so an invalid item doesn't take valid ones down with it.
+    Returns the number of items not stored and the list of those that failed with a retryable error.
+    """
+    failed_count = 0
+    retryable_items = []
+    for item in items:
+        try:
+            dynamodb_client.put_item(TableName=DYNAMO_TABLE, Item=item)
+        except Exception as e:
+            logger.error("Failed to store item %s/%s in DynamoDB: %s", *item_key(item), e)
+            failed_count += 1
+            if not (isinstance(e, ClientError) and e.response["Error"]["Code"] == "ValidationException"):
+                retryable_items.append(item)
+    return failed_count, retryable_items
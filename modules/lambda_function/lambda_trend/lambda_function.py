@@ -2,7 +2,7 @@ import boto3
 import json
 import decimal
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from boto3.dynamodb.conditions import Key
 
 # AWS Clients
@@ -16,7 +16,7 @@ SNS_TOPIC_ARN = os.environ.get("SNS_TOPIC_ARN")
 def get_recent_stock_data(symbol, minutes=5):
     """ Fetch stock data for the last 'minutes' from DynamoDB using Query instead of Scan """
     table = dynamodb.Table(TABLE_NAME)
-    now = datetime.utcnow()
+    now = datetime.now(timezone.utc)
     past_time = now - timedelta(minutes=minutes)
 
     try:
@@ -30,11 +30,17 @@ def get_recent_stock_data(symbol, minutes=5):
         print(f"Error fetching stock data: {e}")
         return []
 
+def get_price(item):
+    """ Price in dollars; items written before the cents migration store 'price' instead of 'price_cents' """
+    if "price_cents" in item:
+        return decimal.Decimal(item["price_cents"]) / 100
+    return decimal.Decimal(item["price"])
+
 def calculate_moving_average(data, period):
     """ Calculate moving average for given period, avoid None issues """
     if len(data) < period:
         return decimal.Decimal("0") 
-    return sum(decimal.Decimal(d["price"]) for d in data[-period:]) / period
+    return sum(get_price(d) for d in data[-period:]) / period
 
 def lambda_handler(event, context):
     """ Main Lambda function """
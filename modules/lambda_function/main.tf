@@ -8,6 +8,7 @@ resource "aws_lambda_function" "this" {
 
   filename         = var.filename
   source_code_hash = var.source_code_hash
+  layers           = var.layers
 
   environment {
     variables = var.environment_variables
@@ -17,6 +18,9 @@ resource "aws_lambda_function" "this" {
 }
 
 resource "aws_lambda_event_source_mapping" "kinesis" {
+  # Only created for stream-triggered functions (e.g. not for scheduled ones)
+  count = var.create_event_source_mapping ? 1 : 0
+
   event_source_arn                   = coalesce(var.event_source_arn, var.kinesis_stream_arn)
   function_name                      = aws_lambda_function.this.arn
   starting_position                  = var.starting_position
@@ -28,6 +32,7 @@ resource "aws_lambda_event_source_mapping" "kinesis" {
   maximum_record_age_in_seconds  = var.maximum_record_age_in_seconds
   bisect_batch_on_function_error = var.bisect_batch_on_function_error
   parallelization_factor         = var.parallelization_factor
+  function_response_types        = var.function_response_types
 
   # Dead letter queue configuration
   dynamic "destination_config" {
@@ -40,4 +45,10 @@ resource "aws_lambda_event_source_mapping" "kinesis" {
   }
 
   depends_on = [aws_lambda_function.this]
-}
\ No newline at end of file
+}
+
+# The mapping used to be a single resource; keep existing mappings instead of recreating them
+moved {
+  from = aws_lambda_event_source_mapping.kinesis
+  to   = aws_lambda_event_source_mapping.kinesis[0]
+}
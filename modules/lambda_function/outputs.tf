@@ -25,15 +25,15 @@ output "qualified_arn" {
 
 output "event_source_mapping_uuid" {
   description = "UUID of the Kinesis event source mapping"
-  value       = aws_lambda_event_source_mapping.kinesis.uuid
+  value       = one(aws_lambda_event_source_mapping.kinesis[*].uuid)
 }
 
 output "event_source_mapping_state" {
   description = "State of the Kinesis event source mapping"
-  value       = aws_lambda_event_source_mapping.kinesis.state
+  value       = one(aws_lambda_event_source_mapping.kinesis[*].state)
 }
 
 output "event_source_mapping_last_modified" {
   description = "Last modified date of the Kinesis event source mapping"
-  value       = aws_lambda_event_source_mapping.kinesis.last_modified
+  value       = one(aws_lambda_event_source_mapping.kinesis[*].last_modified)
 }
\ No newline at end of file
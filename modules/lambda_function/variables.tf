@@ -103,6 +103,17 @@ variable "source_code_hash" {
   default     = null
 }
 
+variable "layers" {
+  description = "List of Lambda layer ARNs to attach to the function. Use to provide third-party dependencies (e.g. yfinance for the producer) that are not bundled in the deployment package."
+  type        = list(string)
+  default     = []
+
+  validation {
+    condition = length(var.layers) <= 5
+    error_message = "A Lambda function can use at most 5 layers."
+  }
+}
+
 variable "description" {
   description = "Description of the Lambda function. Helps document the function's purpose and behavior."
   type        = string
@@ -152,6 +163,12 @@ variable "provisioned_concurrency_config" {
 }
 
 # Kinesis Event Source Mapping Configuration
+variable "create_event_source_mapping" {
+  description = "Whether to create the stream event source mapping. Set to false for functions that are not stream-triggered (e.g. scheduled ones). Must be known at plan time, so it is a separate flag rather than derived from the source ARN."
+  type        = bool
+  default     = true
+}
+
 variable "kinesis_stream_arn" {
   description = "ARN of the Kinesis stream to use as event source. Provided by the kinesis module. Lambda will poll this stream for new records."
   type        = string
@@ -248,6 +265,17 @@ variable "bisect_batch_on_function_error" {
   default     = true
 }
 
+variable "function_response_types" {
+  description = "Response types enabled for the event source mapping. Set to [\"ReportBatchItemFailures\"] when the function returns batchItemFailures, so only the failed part of a batch is retried."
+  type        = list(string)
+  default     = []
+
+  validation {
+    condition = alltrue([for t in var.function_response_types : t == "ReportBatchItemFailures"])
+    error_message = "The only supported function response type is ReportBatchItemFailures."
+  }
+}
+
 variable "tumbling_window_in_seconds" {
   description = "Duration of the tumbling window for processing records. Use for time-based aggregations. 0 disables tumbling windows."
   type        = number
@@ -7,23 +7,47 @@ import yfinance as yf
 # AWS Kinesis Configuration
 kinesis_client = boto3.client('kinesis', region_name='us-east-1')
 STREAM_NAME = os.environ.get("KINESIS_STREAM_NAME", "stock-market-stream")
-STOCK_SYMBOL = "AAPL"
-DELAY_TIME = 30  # Time delay in seconds
+SYMBOLS = [s.strip() for s in os.environ.get("SYMBOLS", "AAPL").split(",") if s.strip()]
+MAX_PUT_RECORDS = 500  # PutRecords batch limit
+MAX_PUT_RETRIES = 3  # Retries for records rejected by PutRecords
+MIN_REMAINING_TIME_MS = 2000  # Stop retrying when the invocation is this close to timing out
 
-# Function to fetch stock data
-def get_stock_data(symbol):
+PRICE_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+SCHEMA_VERSION = 2  # v2: price sent as integer cents (price_cents) instead of a float price
+
+# Mock data is a local testing aid only; it is never sent from the deployed Lambda unless explicitly enabled
+ALLOW_MOCK_DATA = os.environ.get(
+    "ALLOW_MOCK_DATA", "false" if "AWS_LAMBDA_FUNCTION_NAME" in os.environ else "true"
+).lower() == "true"
+
+# Function to fetch price history for all symbols in one batched download
+def get_price_history(symbols):
+    history = {}
     try:
-        stock = yf.Ticker(symbol)
-        
         # Try different periods to get data
         for period in ["2d", "5d", "1wk"]:
-            data = stock.history(period=period)
-            if len(data) >= 2:
+            df = yf.download(symbols, period=period, group_by="ticker", threads=True, progress=False)
+            for symbol in symbols:
+                frame = df.xs(symbol, axis=1, level=0) if df.columns.nlevels > 1 else df
+                rows = frame[PRICE_FIELDS].dropna().tail(2).to_numpy()
+                if len(rows) == 2:
+                    history[symbol] = rows
+            if len(history) == len(symbols):
                 break
-        
-        if len(data) < 2:
+    except Exception as e:
+        print(f"Error fetching stock data: {e}")
+    return history
+
+# Function to build the stock record for a symbol from its last two rows of history
+def get_stock_data(symbol, rows=None):
+    try:
+        if rows is None:
+            if not ALLOW_MOCK_DATA:
+                print(f"❌ No real market data available for {symbol}")
+                return None
+
             # If still no data, create mock data for testing
-            print("No real market data available, generating mock data for testing...")
+            print(f"No real market data available for {symbol}, generating mock data for testing...")
             import random
             base_price = 150.0  # Mock base price for AAPL
             change = random.uniform(-5, 5)
@@ -34,29 +58,34 @@ def get_stock_data(symbol):
                 "open": round(base_price + random.uniform(-2, 2), 2),
                 "high": round(current_price + random.uniform(0, 3), 2),
                 "low": round(current_price - random.uniform(0, 3), 2),
-                "price": round(current_price, 2),
+                "price_cents": int(round(current_price * 100)),
                 "previous_close": round(base_price, 2),
                 "change": round(change, 2),
                 "change_percent": round((change / base_price) * 100, 2),
                 "volume": random.randint(50000000, 100000000),
                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "data_source": "mock"  # Indicate this is test data
+                "data_source": "mock",  # Indicate this is test data
+                "schema_version": SCHEMA_VERSION
             }
             return stock_data
 
         # Use real market data
+        prev, last = rows
+        open_, high, low, close, volume = last
+        prev_close = prev[3]
         stock_data = {
             "symbol": symbol,
-            "open": round(data.iloc[-1]["Open"], 2),
-            "high": round(data.iloc[-1]["High"], 2),
-            "low": round(data.iloc[-1]["Low"], 2),
-            "price": round(data.iloc[-1]["Close"], 2),
-            "previous_close": round(data.iloc[-2]["Close"], 2),
-            "change": round(data.iloc[-1]["Close"] - data.iloc[-2]["Close"], 2),
-            "change_percent": round(((data.iloc[-1]["Close"] - data.iloc[-2]["Close"]) / data.iloc[-2]["Close"]) * 100, 2),
-            "volume": int(data.iloc[-1]["Volume"]),
+            "open": round(open_, 2),
+            "high": round(high, 2),
+            "low": round(low, 2),
+            "price_cents": int(round(close * 100)),
+            "previous_close": round(prev_close, 2),
+            "change": round(close - prev_close, 2),
+            "change_percent": round(((close - prev_close) / prev_close) * 100, 2),
+            "volume": int(volume),
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "data_source": "yfinance"  # Indicate this is real data
+            "data_source": "yfinance",  # Indicate this is real data
+            "schema_version": SCHEMA_VERSION
         }
         return stock_data
         
@@ -64,51 +93,59 @@ def get_stock_data(symbol):
         print(f"Error fetching stock data: {e}")
         return None
 
-# Function to stream data into Kinesis
-def send_to_kinesis():
-    print(f"Starting stock data producer for {STOCK_SYMBOL}")
-    print(f"Sending data to Kinesis stream: {STREAM_NAME}")
-    print(f"Data will be sent every {DELAY_TIME} seconds")
-    print("-" * 50)
-    
-    iteration = 0
-    while True:
-        try:
-            iteration += 1
-            print(f"\n[Iteration {iteration}] Fetching stock data...")
-            
-            stock_data = get_stock_data(STOCK_SYMBOL)
-            if stock_data is None:
-                print("❌ Failed to get stock data, skipping this iteration")
-                time.sleep(DELAY_TIME)
-                continue
-
-            print(f"✅ Got stock data: ${stock_data['price']} ({stock_data['change']:+.2f}, {stock_data['change_percent']:+.2f}%)")
-            print(f"📊 Data source: {stock_data.get('data_source', 'unknown')}")
-
-            # Send to Kinesis
-            response = kinesis_client.put_record(
-                StreamName=STREAM_NAME,
-                Data=json.dumps(stock_data),
-                PartitionKey=STOCK_SYMBOL
-            )
-
-            # Check response
-            if response["ResponseMetadata"]["HTTPStatusCode"] == 200:
-                print(f"🚀 Successfully sent to Kinesis (Shard: {response['ShardId']})")
-            else:
-                print(f"❌ Error sending to Kinesis: {response}")
-
-            print(f"⏳ Waiting {DELAY_TIME} seconds until next iteration...")
-            time.sleep(DELAY_TIME)
-
-        except KeyboardInterrupt:
-            print("\n🛑 Stopping producer (Ctrl+C pressed)")
+# Function to send a batch of records, retrying only the ones Kinesis rejected
+def put_records_with_retry(records, context=None):
+    for attempt in range(MAX_PUT_RETRIES + 1):
+        response = kinesis_client.put_records(StreamName=STREAM_NAME, Records=records)
+        if response["FailedRecordCount"] == 0:
+            return 0
+
+        records = [record for record, result in zip(records, response["Records"]) if "ErrorCode" in result]
+
+        # Stop retrying when the Lambda invocation is about to time out
+        if context is not None and context.get_remaining_time_in_millis() < MIN_REMAINING_TIME_MS:
             break
-        except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            print(f"⏳ Waiting {DELAY_TIME} seconds before retry...")
-            time.sleep(DELAY_TIME)
 
-# Run the streaming function
-send_to_kinesis()
+        if attempt < MAX_PUT_RETRIES:
+            print(f"⚠️ {len(records)} records rejected by Kinesis, retrying...")
+            time.sleep(0.1 * 2 ** attempt)
+
+    return len(records)
+
+# Lambda handler: fetch and send one round of stock data per scheduled invocation
+def producer_handler(event, context):
+    print(f"Fetching stock data for {', '.join(SYMBOLS)}")
+
+    history = get_price_history(SYMBOLS)
+    stock_data_list = [d for d in (get_stock_data(symbol, history.get(symbol)) for symbol in SYMBOLS) if d]
+    if not stock_data_list:
+        # Fail the invocation so the outage shows up in the function's error metrics
+        raise RuntimeError("No stock data available for " + ", ".join(SYMBOLS))
+
+    for stock_data in stock_data_list:
+        print(f"✅ Got {stock_data['symbol']} data: ${stock_data['price_cents'] / 100:.2f} ({stock_data['change']:+.2f}, {stock_data['change_percent']:+.2f}%)")
+        print(f"📊 Data source: {stock_data.get('data_source', 'unknown')}")
+
+    # Send to Kinesis in PutRecords batches
+    records = [{"Data": json.dumps(d), "PartitionKey": d["symbol"]} for d in stock_data_list]
+    failed_count = 0
+    for i in range(0, len(records), MAX_PUT_RECORDS):
+        failed_count += put_records_with_retry(records[i:i + MAX_PUT_RECORDS], context)
+
+    # Check response
+    if failed_count == 0:
+        print(f"🚀 Successfully sent {len(records)} records to Kinesis stream: {STREAM_NAME}")
+    else:
+        print(f"❌ Error sending {failed_count} of {len(records)} records to Kinesis stream: {STREAM_NAME}")
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps({
+            "sent_count": len(records) - failed_count,
+            "failed_count": failed_count
+        })
+    }
+
+# Run a single round locally
+if __name__ == "__main__":
+    producer_handler({}, None)